@@ -1,13 +1,18 @@
 import argparse
+import queue
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
+from .heuristics import run_heuristics
 from .installer import install_packages
 from .parser import get_imports_from_file
+from .pypi import _get_session
 from .resolver import resolve_dependencies
 from .scanner import iter_scan_directory as _iter_scan
 from .scanner import scan_directory  # noqa: F401
-from .utils import HAS_RICH, get_optimal_workers, print_error, print_success, print_warning
+from .utils import HAS_RICH, console, get_optimal_workers, print_block, print_error, print_success, print_warning
 
 
 def is_dev_file(filepath, root_path):
@@ -41,13 +46,6 @@ def get_project_dependencies(root_path):
     Returns (prod_dependencies, dev_dependencies).
     Uses overlapping pipeline: scan → parse happen concurrently.
     """
-    import queue
-    import threading
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-
-    from .heuristics import run_heuristics
-    from .utils import console
-
     prod_imports = set()
     dev_imports = set()
     local_modules = set()
@@ -57,7 +55,6 @@ def get_project_dependencies(root_path):
     def _prewarm_session():
         # type: () -> None
         try:
-            from .pypi import _get_session
             _get_session()
         except Exception:
             pass
@@ -181,7 +178,7 @@ def get_project_dependencies(root_path):
 
     # Deduplicate
     def get_pkg_name(dep):
-        return dep.split("[")[0].split("==")[0].lower()
+        return dep.partition("[")[0].partition("==")[0].lower()
 
     prod_names = set(get_pkg_name(d) for d in resolved_prod)
     final_dev = []
@@ -242,8 +239,6 @@ def command_infer(args):
     if HAS_RICH:
         from rich.tree import Tree
 
-        from .utils import console
-
         tree = Tree("[bold]Project: %s[/bold]" % root_path.name)
 
         if prod_deps:
@@ -261,21 +256,19 @@ def command_infer(args):
         console.print(tree)
         console.print("")
     else:
-        # Plain text fallback
-        print("Project: %s" % root_path.name)
-        print("")
+        # Plain text fallback, emitted as one block
+        lines = ["Project: %s" % root_path.name, ""]
         if prod_deps:
-            print("Production (%d):" % len(prod_deps))
-            for dep in prod_deps:
-                print("  - %s" % dep)
+            lines.append("Production (%d):" % len(prod_deps))
+            lines.extend("  - " + dep for dep in prod_deps)
         else:
-            print("No production dependencies")
-        print("")
+            lines.append("No production dependencies")
+        lines.append("")
         if dev_deps:
-            print("Development (%d):" % len(dev_deps))
-            for dep in dev_deps:
-                print("  - %s" % dep)
-        print("")
+            lines.append("Development (%d):" % len(dev_deps))
+            lines.extend("  - " + dep for dep in dev_deps)
+        lines.append("")
+        print_block(lines)
 
     if start_time:
         print("[BENCH] Total execution time: %.3fs" % (time.time() - start_time))
@@ -312,7 +305,6 @@ def command_install(args):
     print("Installing %d packages..." % len(all_deps))
 
     if HAS_RICH:
-        from .utils import console
         with console.status("[bold green]Installing packages...[/bold green]", spinner="dots"):
             success = install_packages(all_deps)
     else:
@@ -3,8 +3,9 @@
 # A curated list of popular PyPI packages commonly used in imports.
 # This list is used to skip network verification for obvious packages.
 # The presence of a key here means "if a user imports X, it refers to PyPI package X".
+# Frozen: read concurrently by resolver worker threads and never mutated.
 
-KNOWN_PYPI_PACKAGES = {
+KNOWN_PYPI_PACKAGES = frozenset({
     # Data Science / ML
     "numpy", "pandas", "scipy", "matplotlib", "seaborn", "scikit-learn",
     "tensorflow", "torch", "keras", "plotly", "bokeh", "altair", "streamlit",
@@ -71,4 +72,4 @@ KNOWN_PYPI_PACKAGES = {
     # User Specific (from logs)
     "email-validator", "python-multipart", "gunicorn", "uvicorn",
     "python-barcode", "qrcode",
-}
+})
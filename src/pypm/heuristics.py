@@ -46,7 +46,7 @@ def detect_django_database(root_path):
                 deps.add("redis")
 
         except Exception as e:
-            log("Failed to parse settings file %s: %s" % (str(settings_path), str(e)), level="DEBUG")
+            log("Failed to parse settings file %s: %s", settings_path, e, level="DEBUG")
 
     return deps
 
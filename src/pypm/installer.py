@@ -2,7 +2,7 @@ import re
 import sys
 from typing import List  # noqa: F401
 
-from .utils import check_command_exists, log, print_error, run_command
+from .utils import check_command_exists, invalidate_which_cache, log, print_error, run_command
 
 # PEP 508 compliant package name pattern (letters, digits, hyphens, underscores, dots, extras, version specs)
 _SAFE_PACKAGE_RE = re.compile(
@@ -67,20 +67,24 @@ def install_packages(packages):
 
     use_uv = check_command_exists("uv")
 
+    # Built as an argv list: no shell-style re-parsing, and interpreter paths with spaces stay intact
     if use_uv:
         log("Found uv, using it for installation...", level="INFO")
-        command_str = "uv pip install "
+        command = ["uv", "pip", "install"]
         # Check if running in venv
         if sys.prefix == sys.base_prefix:
             log("No virtual environment detected, using --system for uv.", level="WARNING")
-            command_str += "--system "
-        command_str += " ".join(safe_packages)
+            command.append("--system")
     else:
         log("uv not found, falling back to pip...", level="INFO")
-        command_str = "%s -m pip install %s" % (sys.executable, " ".join(safe_packages))
-
-    log("Installing: %s" % ", ".join(safe_packages), level="DEBUG")
-    if run_command(command_str):
+        command = [sys.executable, "-m", "pip", "install"]
+    command.extend(safe_packages)
+
+    log("Installing: %s", ", ".join(safe_packages), level="DEBUG")
+    installed = run_command(command)
+    # Installed packages may ship console scripts, so PATH lookups are stale either way
+    invalidate_which_cache()
+    if installed:
         log("Successfully installed packages.", level="DEBUG")
         return True
     else:
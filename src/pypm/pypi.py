@@ -3,6 +3,7 @@ import os
 import re
 import stat
 import threading
+import time
 from pathlib import Path  # noqa: F401
 from typing import Any, Dict, List, Optional  # noqa: F401
 
@@ -12,17 +13,31 @@ from .utils import log
 CACHE_DIR = Path.home() / ".cache" / "pypm"
 CACHE_FILE = CACHE_DIR / "cache.json"
 
+# Import -> package resolutions from previous runs, trusted for 24h
+RESOLVE_CACHE_FILE = CACHE_DIR / "resolve.json"
+RESOLVE_CACHE_TTL = 24 * 60 * 60
+
 # Security: Valid PyPI package name pattern (PEP 508)
 _VALID_PYPI_NAME_RE = re.compile(r'^[A-Za-z0-9]([A-Za-z0-9._-]*[A-Za-z0-9])?$')
 
+# A resolved dependency as stored in the resolve cache: a PyPI name plus optional [extra,...]
+_RESOLVED_SPEC_RE = re.compile(
+    r'^[A-Za-z0-9]([A-Za-z0-9._-]*[A-Za-z0-9])?'
+    r'(\[[A-Za-z0-9][A-Za-z0-9._-]*(,[A-Za-z0-9][A-Za-z0-9._-]*)*\])?$'
+)
+
 # Characters that must never appear in URL path segments
 _URL_UNSAFE_RE = re.compile(r'[/\\?#&=@:;{}\[\]|^~`\s]')
 
+# Start of an extras list or version specifier; everything from here on is dropped
+_SPEC_START_RE = re.compile(r'[\[=<>!]')
+
 # Lock only for writes (CPython GIL protects dict reads)
 _WRITE_LOCK = threading.Lock()
 
 # Flag to track if cache is dirty (needs flushing)
 _CACHE_DIRTY = False
+_RESOLVE_DIRTY = False
 
 
 def _sanitize_package_name(name):
@@ -35,7 +50,7 @@ def _sanitize_package_name(name):
         return None
 
     # Strip extras and version specifiers for URL purposes
-    clean = name.split("[")[0].split("=")[0].split("<")[0].split(">")[0].split("!")[0].strip()
+    clean = _SPEC_START_RE.split(name, 1)[0].strip()
 
     if not clean:
         return None
@@ -86,18 +101,32 @@ def _slim_metadata(data):
     }
 
 
-def load_cache():
-    # type: () -> dict
-    if not CACHE_FILE.exists():
+def _validate_resolve_entry(entry):
+    # type: (Any) -> bool
+    """
+    Resolve cache entries are {"r": package spec, "t": unix time}.
+    The spec skips every PyPI lookup and ends up in pyproject.toml, so it must be a plain name[extras].
+    """
+    if not isinstance(entry, dict):
+        return False
+    result = entry.get("r")
+    if not isinstance(result, str) or len(result) > 300 or not _RESOLVED_SPEC_RE.match(result):
+        return False
+    return isinstance(entry.get("t"), (int, float))
+
+
+def _load_json_cache(path, validator):
+    # type: (Path, Any) -> dict
+    if not path.exists():
         return {}
     try:
-        with open(str(CACHE_FILE), "r") as f:
+        with open(str(path), "r") as f:
             data = json.load(f)
         if not isinstance(data, dict):
             return {}
         validated = {}
         for key, val in data.items():
-            if _validate_cache_entry(val):
+            if validator(val):
                 validated[key] = val
         return validated
     except (json.JSONDecodeError, ValueError):
@@ -106,20 +135,42 @@ def load_cache():
         return {}
 
 
-def save_cache(cache):
-    # type: (dict) -> None
+def _save_json_cache(path, cache):
+    # type: (Path, dict) -> None
     try:
         CACHE_DIR.mkdir(parents=True, exist_ok=True)
         _set_secure_permissions(CACHE_DIR)
-        with open(str(CACHE_FILE), "w") as f:
+        with open(str(path), "w") as f:
             json.dump(cache, f, separators=(",", ":"))  # Compact JSON
-        _set_secure_permissions(CACHE_FILE)
+        _set_secure_permissions(path)
     except Exception as e:
-        log("Failed to save cache: %s" % str(e), level="DEBUG")
+        log("Failed to save cache: %s", e, level="DEBUG")
+
+
+def load_cache():
+    # type: () -> dict
+    return _load_json_cache(CACHE_FILE, _validate_cache_entry)
+
+
+def save_cache(cache):
+    # type: (dict) -> None
+    _save_json_cache(CACHE_FILE, cache)
+
+
+def _load_resolve_cache():
+    # type: () -> dict
+    """Loads the resolve cache, dropping entries older than RESOLVE_CACHE_TTL."""
+    cutoff = time.time() - RESOLVE_CACHE_TTL
+    return dict(
+        (key, val)
+        for key, val in _load_json_cache(RESOLVE_CACHE_FILE, _validate_resolve_entry).items()
+        if val["t"] >= cutoff
+    )
 
 
 # Global Cache
 _PACKAGE_CACHE = load_cache()
+_RESOLVE_CACHE = _load_resolve_cache()
 
 # Memory cache for current execution (lock-free reads under GIL)
 _METADATA_MEMORY_CACHE = {}  # type: Dict[str, Any]
@@ -151,10 +202,16 @@ try:
     from requests.adapters import HTTPAdapter
     _HAS_REQUESTS = True
 except ImportError:
+    import http.client
     import urllib.error
     import urllib.request
     _HAS_REQUESTS = False
 
+# Per-thread keep-alive connection for the urllib fallback (no requests installed)
+_THREAD_LOCAL = threading.local()
+
+_MAX_RESPONSE_BYTES = 5 * 1024 * 1024
+
 
 def _get_session():
     # type: () -> Any
@@ -173,6 +230,40 @@ def _get_session():
     return _SESSION
 
 
+def _keepalive_request(method, path):
+    # type: (str, str) -> Any
+    """
+    Sends a GET/HEAD for a pypi.org path over this thread's persistent HTTPS connection.
+    Returns (status, body). Reusing the connection skips a TCP + TLS handshake
+    per lookup, which the plain urlopen() fallback pays every time.
+    """
+    for attempt in (0, 1):
+        conn = getattr(_THREAD_LOCAL, "conn", None)
+        if conn is None:
+            conn = http.client.HTTPSConnection("pypi.org", timeout=3)
+            _THREAD_LOCAL.conn = conn
+        try:
+            conn.request(method, path, headers={"User-Agent": "pypm-cli/0.0.6"})
+            resp = conn.getresponse()
+            body = resp.read(_MAX_RESPONSE_BYTES + 1)
+            if len(body) > _MAX_RESPONSE_BYTES:
+                # Unread remainder would poison the connection; drop it
+                conn.close()
+                _THREAD_LOCAL.conn = None
+            return resp.status, body
+        except (http.client.HTTPException, ConnectionError):
+            # Server closed an idle keep-alive connection: retry once on a fresh one
+            conn.close()
+            _THREAD_LOCAL.conn = None
+            if attempt:
+                raise
+        except Exception:
+            conn.close()
+            _THREAD_LOCAL.conn = None
+            raise
+    return None, b""
+
+
 def _mark_dirty():
     # type: () -> None
     global _CACHE_DIRTY
@@ -181,12 +272,36 @@ def _mark_dirty():
 
 def flush_cache():
     # type: () -> None
-    """Flush in-memory cache to disk. Called once at end of resolution."""
-    global _CACHE_DIRTY
+    """Flush in-memory caches to disk. Called once at end of resolution."""
+    global _CACHE_DIRTY, _RESOLVE_DIRTY
     with _WRITE_LOCK:
         if _CACHE_DIRTY:
             save_cache(_PACKAGE_CACHE)
             _CACHE_DIRTY = False
+        if _RESOLVE_DIRTY:
+            _save_json_cache(RESOLVE_CACHE_FILE, _RESOLVE_CACHE)
+            _RESOLVE_DIRTY = False
+
+
+def get_cached_resolution(key):
+    # type: (str) -> Optional[str]
+    """
+    Looks up a previous run's resolution for an import group.
+    Returns the package spec, or None if there is no fresh entry.
+    """
+    entry = _RESOLVE_CACHE.get(key)
+    if entry is None or time.time() - entry["t"] > RESOLVE_CACHE_TTL:
+        return None
+    return entry["r"]
+
+
+def cache_resolution(key, result):
+    # type: (str, str) -> None
+    """Records an import group's resolution; persisted by flush_cache()."""
+    global _RESOLVE_DIRTY
+    with _WRITE_LOCK:
+        _RESOLVE_CACHE[key] = {"r": result, "t": int(time.time())}
+        _RESOLVE_DIRTY = True
 
 
 def get_pypi_metadata(package_name):
@@ -228,7 +343,7 @@ def get_pypi_metadata(package_name):
             resp = session.get(url, timeout=3)
             if resp.status_code == 200:
                 raw_data = resp.content
-                if len(raw_data) > 5 * 1024 * 1024:
+                if len(raw_data) > _MAX_RESPONSE_BYTES:
                     return None
                 data = resp.json()
             elif resp.status_code == 404:
@@ -238,28 +353,42 @@ def get_pypi_metadata(package_name):
                     _mark_dirty()
                 return None
         except Exception as e:
-            log("Error fetching %s: %s" % (clean_name, str(e)), level="DEBUG")
+            log("Error fetching %s: %s", clean_name, e, level="DEBUG")
             return None
     else:
-        req = urllib.request.Request(url, headers={"User-Agent": "pypm-cli/0.0.6"})
         try:
-            with urllib.request.urlopen(req, timeout=3) as response:
-                if response.status == 200:
-                    raw_data = response.read()
-                    if len(raw_data) > 5 * 1024 * 1024:
-                        return None
-                    data = json.loads(raw_data.decode("utf-8"))
-        except urllib.error.HTTPError as e:
-            if e.code == 404:
-                with _WRITE_LOCK:
-                    _METADATA_MEMORY_CACHE[clean_name] = None
-                    _PACKAGE_CACHE[clean_name] = False
-                    _mark_dirty()
-                return None
+            status, raw_data = _keepalive_request("GET", "/pypi/%s/json" % clean_name)
         except Exception as e:
-            log("Error fetching %s: %s" % (clean_name, str(e)), level="DEBUG")
+            log("Error fetching %s: %s", clean_name, e, level="DEBUG")
             return None
 
+        if status == 200:
+            if len(raw_data) > _MAX_RESPONSE_BYTES:
+                return None
+            try:
+                data = json.loads(raw_data.decode("utf-8"))
+            except ValueError:
+                return None
+        elif status == 404:
+            with _WRITE_LOCK:
+                _METADATA_MEMORY_CACHE[clean_name] = None
+                _PACKAGE_CACHE[clean_name] = False
+                _mark_dirty()
+            return None
+        elif status is not None and 300 <= status < 400:
+            # Redirects are rare on the JSON API; let urllib follow them
+            req = urllib.request.Request(url, headers={"User-Agent": "pypm-cli/0.0.6"})
+            try:
+                with urllib.request.urlopen(req, timeout=3) as response:
+                    if response.status == 200:
+                        raw_data = response.read()
+                        if len(raw_data) > _MAX_RESPONSE_BYTES:
+                            return None
+                        data = json.loads(raw_data.decode("utf-8"))
+            except Exception as e:
+                log("Error fetching %s: %s", clean_name, e, level="DEBUG")
+                return None
+
     # Validate, slim down, and cache
     if data is not None and isinstance(data, dict) and "info" in data:
         slim = _slim_metadata(data)
@@ -311,25 +440,39 @@ def check_package_exists_head(package_name):
             return cached
         return True
 
-    url = "https://pypi.org/pypi/%s/json" % clean_name
     session = _get_session()
 
     if session is not None:
         try:
-            resp = session.head(url, timeout=2, allow_redirects=True)
-            exists = resp.status_code == 200
-            with _WRITE_LOCK:
-                if not exists:
-                    _METADATA_MEMORY_CACHE[clean_name] = None
-                    _PACKAGE_CACHE[clean_name] = False
-                    _mark_dirty()
-            return exists
+            resp = session.head("https://pypi.org/pypi/%s/json" % clean_name, timeout=2, allow_redirects=True)
+            status = resp.status_code
         except Exception:
-            pass
+            return False
     else:
-        return check_package_exists(package_name)
+        try:
+            status, _ = _keepalive_request("HEAD", "/pypi/%s/json" % clean_name)
+        except Exception:
+            return False
+        if status is None or 300 <= status < 400:
+            # Let the GET path follow the redirect
+            return check_package_exists(package_name)
 
-    return False
+    if status == 404:
+        with _WRITE_LOCK:
+            _METADATA_MEMORY_CACHE[clean_name] = None
+            _PACKAGE_CACHE[clean_name] = False
+            _mark_dirty()
+        return False
+    if status != 200:
+        # 429/5xx say nothing about the project: don't persist them as "missing"
+        return False
+
+    with _WRITE_LOCK:
+        if clean_name not in _PACKAGE_CACHE:
+            # Persist positive probes too, so later runs resolve variations offline
+            _PACKAGE_CACHE[clean_name] = True
+            _mark_dirty()
+    return True
 
 
 def get_latest_version(package_name):
@@ -1,9 +1,23 @@
+import functools
 import sys
-from typing import Any, Dict, List, Optional, Set  # noqa: F401
+import types
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple  # noqa: F401
 
+from . import utils
 from .db import KNOWN_PYPI_PACKAGES
-from .pypi import check_package_exists, find_pypi_package, flush_cache
-from .utils import get_optimal_workers, log
+from .pypi import (
+    cache_resolution,
+    check_package_exists,
+    check_package_exists_head,
+    find_pypi_package,
+    flush_cache,
+    get_cached_resolution,
+    get_package_extras,
+)
+from .scanner import iter_scan_directory
+from .utils import get_optimal_workers, log, print_step
 
 # --- importlib.metadata compatibility ---
 try:
@@ -18,8 +32,9 @@ except ImportError:
 if sys.version_info >= (3, 10):
     STDLIB_MODULES = sys.stdlib_module_names  # novm
 else:
-    # Python < 3.10 fallback — comprehensive stdlib list
-    # Covers all public modules present in Python 3.5–3.9
+    # Python < 3.10 fallback — complete stdlib list
+    # Covers all public modules present in Python 3.5–3.9 (every non-underscore
+    # sys.stdlib_module_names entry); a miss here costs an online PyPI lookup
     STDLIB_MODULES = frozenset({
         # Core / Built-in
         "os", "sys", "re", "math", "random", "datetime", "json", "logging",
@@ -73,7 +88,7 @@ else:
         # Markup
         "html.parser", "xml.etree", "xml.dom", "xml.sax",
         # Encoding
-        "encodings", "chardet",
+        "encodings",
         # Windows-specific (present but may not be usable on *nix)
         "winreg", "winsound", "msvcrt", "msilib",
         # Unix-specific
@@ -83,8 +98,25 @@ else:
         "tkinter", "turtle",
         # Other stdlib
         "mailbox", "mimetypes", "optparse", "formatter",
+        # Remaining public modules (cross-checked against sys.stdlib_module_names)
+        "aifc", "antigravity", "asynchat", "asyncore", "bdb", "calendar",
+        "chunk", "cmath", "cmd", "compileall", "contextvars", "crypt", "curses",
+        "distutils", "ensurepip", "faulthandler", "genericpath", "getopt",
+        "idlelib", "imp", "lib2to3", "linecache", "mailcap", "modulefinder",
+        "nis", "nntplib", "nt", "nturl2path", "opcode", "ossaudiodev",
+        "pickletools", "pipes", "plistlib", "py_compile", "pyclbr", "pydoc",
+        "pydoc_data", "pyexpat", "rlcompleter", "runpy", "select", "shlex",
+        "smtpd", "socketserver", "spwd", "sre_compile", "sre_constants",
+        "sre_parse", "ssl", "stringprep", "sunau", "symtable", "tabnanny",
+        "telnetlib", "this", "tracemalloc", "turtledemo", "venv", "wsgiref",
+        "xdrlib", "zipapp", "zoneinfo",
+        # Since removed, but shipped by some of 3.5–3.9
+        "binhex", "dummy_threading", "macpath", "parser",
     })
 
+# Single-pass name normalization tables for str.translate
+_NORM_TABLE = str.maketrans({"_": "-", ".": "-"})
+
 # Common import name -> PyPI package name mappings
 # Kept as a fast-path cache for known non-obvious mappings
 COMMON_MAPPINGS = {
@@ -145,35 +177,73 @@ COMMON_MAPPINGS = {
     "rtree": "Rtree",
 }
 
-# Pre-computed lowercase lookup for O(1) case-insensitive matching
-COMMON_MAPPINGS_LOWER = {k.lower(): v for k, v in COMMON_MAPPINGS.items()}
+# Pre-computed lowercase lookup for O(1) case-insensitive matching (read-only, shared across worker threads)
+COMMON_MAPPINGS_LOWER = types.MappingProxyType({sys.intern(k.lower()): v for k, v in COMMON_MAPPINGS.items()})
 
-# Framework specific additions (if key is found, add value)
+# Framework specific additions (if key is found, add value). Keys are lowercase.
 FRAMEWORK_EXTRAS = {
-    "fastapi": ["uvicorn[standard]", "python-multipart", "email-validator"],
-    "flask": ["gunicorn"],
-    "django": ["gunicorn", "psycopg2-binary"],
-    "celery": ["redis"],
-    "passlib": ["passlib[bcrypt]", "bcrypt==4.1.2"],
-    "sqlalchemy": ["greenlet"],
-    "pandas": ["openpyxl"],
-    "uvicorn": ["uvicorn[standard]"],
+    "fastapi": ("uvicorn[standard]", "python-multipart", "email-validator"),
+    "flask": ("gunicorn",),
+    "django": ("gunicorn", "psycopg2-binary"),
+    "celery": ("redis",),
+    "passlib": ("passlib[bcrypt]", "bcrypt==4.1.2"),
+    "sqlalchemy": ("greenlet",),
+    "pandas": ("openpyxl",),
+    "uvicorn": ("uvicorn[standard]",),
 }
 
+FRAMEWORK_TRIGGERS = frozenset(FRAMEWORK_EXTRAS)
+
+# Sentinel values in _ALIAS_TABLE for names that are not PyPI packages
+_STDLIB = object()
+_SKIP = object()
+
+
+def _norm_key(name):
+    # type: (str) -> str
+    """Normalized, interned table key: built once at import, probed for every import."""
+    return sys.intern(name.lower().translate(_NORM_TABLE))
+
+
+def _build_alias_table():
+    # type: () -> Dict[str, Any]
+    """
+    Folds the stdlib, suspicious, common-mapping and known-package lookups into
+    one dict keyed by normalized name (lowercase, '_' and '.' -> '-').
+    Sources are applied lowest priority first, so stdlib wins over everything.
+    """
+    table = {}  # type: Dict[str, Any]
+
+    for name in KNOWN_PYPI_PACKAGES:
+        key = _norm_key(name)
+        # Prefer the canonical spelling when two entries normalize alike
+        if key == name or key not in table:
+            table[key] = name
+
+    for name, package in COMMON_MAPPINGS.items():
+        table[_norm_key(name)] = package
+
+    for name in SUSPICIOUS_PACKAGES:
+        table[_norm_key(name)] = _SKIP
+
+    for name in STDLIB_MODULES:
+        table[_norm_key(name)] = _STDLIB
+
+    return table
+
+
+@functools.lru_cache(maxsize=None)
 def is_stdlib(module_name):
     """
     Checks if a module is in the standard library.
     """
-    if module_name.startswith("_"):
-        return True
-
-    base_module = module_name.split(".")[0]
-    return base_module in STDLIB_MODULES
+    # Frozenset membership first: the common case short-circuits before the underscore test
+    return module_name.partition(".")[0] in STDLIB_MODULES or module_name.startswith("_")
 
 
 
 # Packages that exist on PyPI but are almost always local modules or namespace roots in user projects
-SUSPICIOUS_PACKAGES = {
+SUSPICIOUS_PACKAGES = frozenset({
     # Generic project structure names
     "core", "modules", "crm", "ledgers", "config", "utils", "common",
     "tests", "test", "settings", "db", "database",
@@ -186,23 +256,126 @@ SUSPICIOUS_PACKAGES = {
     "google", "azure", "amazon", "aws",
     # Common project names that also exist on PyPI
     "setup", "manage", "server", "worker", "run", "start",
-}
+})
+
+_ALIAS_TABLE = _build_alias_table()
+
+
+def _collect_local_modules(project_root):
+    # type: (str) -> frozenset
+    """
+    Single scan of project_root for importable local names: stems of .py files
+    and names of package directories (containing __init__.py). Skips venvs,
+    caches and build dirs via the scanner. Not cached: files come and go.
+    """
+    local_modules = set()
+    for path in iter_scan_directory(Path(project_root)):
+        local_modules.add(path.stem)
+        if path.name == "__init__.py":
+            local_modules.add(path.parent.name)
+    return frozenset(local_modules)
+
+
+def _longest_known_prefix(module):
+    # type: (str) -> Optional[Tuple[str, str]]
+    """
+    Returns (package, prefix key) for the longest prefix of a dotted import found
+    in the alias table, e.g. "google.cloud.storage.blob" -> "google-cloud-storage",
+    "psycopg2.extras" -> "psycopg2-binary". The full name is the caller's job.
+    Pure dict lookups, no network.
+    """
+    parts = module.split(".")
+    for i in range(len(parts) - 1, 0, -1):
+        key = _norm_key("-".join(parts[:i]))
+        hit = _ALIAS_TABLE.get(key)
+        if hit is not None and hit is not _STDLIB and hit is not _SKIP:
+            return hit, key
+    return None
+
+
+def _classify_import(module, known_local_modules):
+    # type: (str, Any) -> Any
+    """
+    Classifies a single import without touching the network.
+    Returns (kind, value, key):
+      ("skip", None, None)            stdlib, local or suspicious name
+      ("dep", package, norm_name)     resolved by a fast path
+      ("sub", package, prefix_key)    submodule of a fast-path package, may add extras
+      ("check", module, base_part)    needs online verification, deduplicated by base_part
+    """
+    base_module, dot, _ = module.partition(".")
+
+    # 1. Local module filter
+    if base_module in known_local_modules:
+        return "skip", None, None
+
+    # Lowercase + normalize once; undotted imports (the common case) reuse it for the base
+    norm_module_name = module.lower().translate(_NORM_TABLE)
+    norm_base = base_module.lower().translate(_NORM_TABLE) if dot else norm_module_name
+
+    # 2. Stdlib submodules (email.mime.text): the base decides
+    if dot and _ALIAS_TABLE.get(norm_base) is _STDLIB:
+        return "skip", None, None
+
+    # 3. Single lookup covers stdlib, suspicious names, common mappings and known packages
+    hit = _ALIAS_TABLE.get(norm_module_name)
+    if hit is _STDLIB or hit is _SKIP:
+        return "skip", None, None
+    if hit is not None:
+        return "dep", hit, norm_module_name
+
+    # 4. Known prefix (google.cloud.storage.blob -> google-cloud-storage, psycopg2.extras
+    #    -> psycopg2-binary): offline, so every import gets it, not just its group's leader
+    if dot:
+        known = _longest_known_prefix(module)
+        if known:
+            return "sub", known[0], known[1]
+
+    # 5. Online check, deduplicated by base module
+    return "check", module, norm_base
+
+
+def _resolution_key(modules):
+    # type: (List[str]) -> str
+    """Resolve-cache key for an import group: siblings change the extras, so all of them count."""
+    return ",".join(sorted(modules))
 
+
+@functools.lru_cache(maxsize=None)
+def _installed_versions():
+    # type: () -> Dict[str, str]
+    """
+    Maps every installed distribution (normalized name) to its version.
+    Built once on first use; the first distribution on sys.path wins, as in importlib.metadata.version.
+    """
+    versions = {}  # type: Dict[str, str]
+    if _importlib_metadata is None:
+        return versions
+    try:
+        for dist in _importlib_metadata.distributions():
+            # Broken metadata only costs that one distribution
+            try:
+                name = dist.metadata["Name"]
+                if name:
+                    versions.setdefault(_norm_key(name), dist.version)
+            except Exception:
+                continue
+    except Exception:
+        pass  # A failing finder ends the walk; keep what was collected
+    return versions
+
+
+@functools.lru_cache(maxsize=None)
 def get_installed_version(package_name):
     """
     Attempts to get the installed version of a package.
     Returns the package name with version specifier if found, else just package name.
     """
-    if _importlib_metadata is None:
-        return package_name
-
     # Clean package name for lookup (remove extras)
-    clean_name = package_name.split("[")[0]
-    try:
-        version = _importlib_metadata.version(clean_name)
-        return "%s==%s" % (package_name, version)
-    except Exception:
-        return package_name
+    version = _installed_versions().get(_norm_key(package_name.split("[", 1)[0]))
+    if version:
+        return package_name + "==" + version
+    return package_name
 
 def resolve_dependencies(imports, project_root, known_local_modules=None):
     """
@@ -211,146 +384,138 @@ def resolve_dependencies(imports, project_root, known_local_modules=None):
     """
     dependencies = []
 
-    from concurrent.futures import ThreadPoolExecutor, as_completed
-
-    # Prepare filtering sets
+    # Prepare filtering sets (the CLI passes modules found during its own scan)
     if known_local_modules is None:
-        known_local_modules = set()
+        known_local_modules = _collect_local_modules(project_root)
 
     # ---- BATCH FILTER: stdlib + local + suspicious (set operations) ----
-    # Build lowercase stdlib set for case-insensitive matching
-    stdlib_lower = frozenset(m.lower() for m in STDLIB_MODULES)
-
-    # Pre-compute base modules and filter in bulk
-    candidates_to_check = []
-    resolved_bases = set()
-    seen_bases = set()
-
-    for module in imports:
-        module_lower = module.lower()
-        base_module = module.split(".")[0]
-
-        # 1. Batch stdlib filter (O(1) set lookup)
-        if module in STDLIB_MODULES or module_lower in stdlib_lower:
-            continue
-        if base_module in STDLIB_MODULES or base_module.lower() in stdlib_lower:
-            continue
-
-        # 2. Local module filter
-        if base_module in known_local_modules:
-            continue
-
-        # 3. Suspicious names filter
-        if module in SUSPICIOUS_PACKAGES:
-            continue
-
-        # 4. Fast Path: Common Mappings (O(1) lookup via pre-computed lowercase dict)
-        module_lower = module.lower()
-        if module in COMMON_MAPPINGS:
-            dependencies.append(COMMON_MAPPINGS[module])
-            resolved_bases.add(module_lower.replace("_", "-"))
-            continue
-
-        mapped = COMMON_MAPPINGS_LOWER.get(module_lower)
-        if mapped is not None:
-            dependencies.append(mapped)
-            resolved_bases.add(module_lower.replace("_", "-"))
-            continue
-
-        # 5. Fast Path: Known Packages
-        norm_module_name = module_lower.replace("_", "-").replace(".", "-")
-
-        if norm_module_name in KNOWN_PYPI_PACKAGES:
-             dependencies.append(norm_module_name)
-             resolved_bases.add(norm_module_name)
-             continue
-
-        if module_lower in KNOWN_PYPI_PACKAGES:
-             dependencies.append(module_lower)
-             resolved_bases.add(module_lower)
-             continue
-
-        # 6. Queue for Online Check (deduplicate by base module)
-        base_part = module.split(".")[0].lower().replace("_", "-")
-        if base_part in resolved_bases and "." in module:
-            continue
-        if base_part in seen_bases:
-            continue
-        seen_bases.add(base_part)
-
-        candidates_to_check.append(module)
+    # Exact stdlib and local names (os, json, myapp) are the bulk of most projects
+    # and always skip; drop them with one C-level set difference first
+    pending = set(imports).difference(STDLIB_MODULES, known_local_modules)
+
+    # Online candidates grouped by normalized base: one verification task per base
+    candidates_to_check = {}  # type: Dict[str, List[str]]
+    # Fast-path packages by normalized name; a group with the same base (import pipecat
+    # -> pipecat-ai, plus pipecat.aws) only needs its extras looked up
+    fast_bases = {}  # type: Dict[str, str]
+
+    for module in pending:
+        kind, value, key = _classify_import(module, known_local_modules)
+
+        if kind == "dep":
+            dependencies.append(value)
+            fast_bases[key] = value
+        elif kind == "sub":
+            # Resolved offline like "dep", then grouped so its submodule can add extras
+            dependencies.append(value)
+            fast_bases[key] = value
+            group = candidates_to_check.get(key)
+            if group is None:
+                candidates_to_check[key] = [module]
+            else:
+                group.append(module)
+        elif kind == "check":
+            # Queue for Online Check (siblings share their base's task)
+            group = candidates_to_check.get(key)
+            if group is None:
+                candidates_to_check[key] = [value]
+            else:
+                group.append(value)
 
     # 5. Online Verification (Parallelized for speed)
     if candidates_to_check:
-        from .pypi import get_package_extras
-        from .utils import print_step
-
         verified_deps = set()
 
-        def processing_task(module):
-            # Try 1: Known Namespace Package?
-            hyphenated = module.lower().replace("_", "-").replace(".", "-")
-            if hyphenated in KNOWN_PYPI_PACKAGES:
-                return hyphenated, None
+        def with_extras(base_pkg, modules):
+            # Fetch extras for the base package once, match every sibling's submodule
+            extras = get_package_extras(base_pkg)
+            matched = sorted(set(m.rsplit(".", 1)[-1] for m in modules if "." in m).intersection(extras))
+            if matched:
+                return base_pkg + "[" + ",".join(matched) + "]"
+            return base_pkg
+
+        def processing_task(group):
+            key, modules = group
+            # The first module (sorted, so runs agree) drives resolution; siblings only contribute extras
+            module = modules[0]
+
+            # Base already resolved offline: the submodules can only add extras to it
+            fast_pkg = fast_bases.get(key)
+            if fast_pkg is not None:
+                return with_extras(fast_pkg.partition("[")[0].partition("==")[0], modules)
+
+            # Known prefixes were already matched offline by _classify_import
 
-            # Try 2: Exact Match
+            # Try 1: Exact Match
             if check_package_exists(module):
-                return module, None
+                return module
 
-            # Try 3: Base Module Match
+            # Try 2: Base Module Match
             if "." in module:
-                base = module.split(".")[0]
-
-                # Check base in KNOWN_PYPI_PACKAGES
-                norm_base = base.lower().replace("_", "-")
-                if norm_base in KNOWN_PYPI_PACKAGES:
-                    return norm_base, None
+                base = module.partition(".")[0]
+                base_lower = base.lower()
 
                 # O(1) check via pre-computed lowercase dict
-                base_pkg = COMMON_MAPPINGS_LOWER.get(base.lower())
+                base_pkg = COMMON_MAPPINGS_LOWER.get(base_lower)
 
-                if not base_pkg:
-                    if base.lower() not in SUSPICIOUS_PACKAGES:
-                        base_pkg = find_pypi_package(base)
+                if not base_pkg and base_lower not in SUSPICIOUS_PACKAGES:
+                    base_pkg = find_pypi_package(base)
 
                 if base_pkg:
-                    submodule_suffix = module.split(".")[-1]
-
-                    # Fetch extras for the base package
-                    extras = get_package_extras(base_pkg)
-                    if submodule_suffix in extras:
-                        return "%s[%s]" % (base_pkg, submodule_suffix), None
-                    return base_pkg, None
+                    return with_extras(base_pkg, modules)
 
-            # Try 4: Generic Namespace Package check
+            # Try 3: Generic Namespace Package check (known prefixes were matched offline)
             if "." in module:
-                hyphenated = module.replace(".", "-")
-                if check_package_exists(hyphenated):
-                    return hyphenated, None
+                # PEP 503 form in one pass (the cache and URL use it anyway)
+                hyphenated = module.lower().translate(_NORM_TABLE)
+                # Existence only: HEAD avoids downloading the project's JSON metadata
+                if check_package_exists_head(hyphenated):
+                    return hyphenated
 
-            # Try 5: Common variations (last resort)
+            # Try 4: Common variations (last resort)
             found = find_pypi_package(module)
             if found:
-                return found, None
-
-            return None, module
-
-        workers = get_optimal_workers(len(candidates_to_check), io_bound=True)
-        with ThreadPoolExecutor(max_workers=workers) as executor:
-            future_to_module = dict((executor.submit(processing_task, m), m) for m in candidates_to_check)
+                return found
+
+            return None
+
+        def verify_task(group):
+            key, modules = group
+            # Errors are reported per candidate so one failure doesn't abort the whole map()
+            try:
+                result = processing_task(group)
+            except Exception as e:
+                log("Error verifying %s: %s" % (modules[0], str(e)), level="ERROR")
+                return modules[0], None
+            # Only hits are recorded: a miss may be a network error, and 404s are already cached by pypi.
+            # Extras-only groups depend on the fast-path package, not just the modules, so they aren't.
+            if result and key not in fast_bases:
+                cache_resolution(_resolution_key(modules), result)
+            return modules[0], result
+
+        # Groups resolved by a recent run need no network at all
+        groups_to_verify = []
+        for key, modules in candidates_to_check.items():
+            modules.sort()
+            cached = None if key in fast_bases else get_cached_resolution(_resolution_key(modules))
+            if cached:
+                verified_deps.add(cached)
+            else:
+                groups_to_verify.append((key, modules))
 
-            for future in as_completed(future_to_module):
-                try:
-                    result, error_module = future.result()
+        if groups_to_verify:
+            workers = get_optimal_workers(len(groups_to_verify), io_bound=True)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # Results only feed a set, so completion order is irrelevant
+                for module, result in executor.map(verify_task, groups_to_verify):
                     if result:
-                        log("Verified '%s' -> '%s'" % (future_to_module[future], result), level="DEBUG")
+                        if utils.VERBOSE:
+                            log("Verified '%s' -> '%s'" % (module, result), level="DEBUG")
                         verified_deps.add(result)
-                    else:
-                        log("Warning: Could not find package for import '%s' on PyPI." % error_module, level="DEBUG")
-                except Exception as e:
-                    log("Error verifying %s: %s" % (future_to_module[future], str(e)), level="ERROR")
+                    elif utils.VERBOSE:
+                        log("Warning: Could not find package for import '%s' on PyPI." % module, level="DEBUG")
 
-        dependencies.extend(list(verified_deps))
+        dependencies.extend(verified_deps)
 
         # Flush cache to disk once after all network checks are done
         flush_cache()
@@ -358,101 +523,44 @@ def resolve_dependencies(imports, project_root, known_local_modules=None):
     # 6. Apply Framework Extras
     final_deps = set(dependencies)
 
-    framework_additions = []
+    framework_additions = []  # type: List[str]
 
+    # One pass over the deps, then emit in FRAMEWORK_EXTRAS order for a stable message
+    triggered = FRAMEWORK_TRIGGERS.intersection(dep.split("[", 1)[0].lower() for dep in final_deps)
     for trigger, extras in FRAMEWORK_EXTRAS.items():
-        trace_found = False
-        for dep in final_deps:
-            if dep.split("[")[0].lower() == trigger.lower():
-                trace_found = True
-                break
-
-        if trace_found:
+        if trigger in triggered:
             framework_additions.extend(extras)
 
     if framework_additions:
-        from .utils import print_step
         print_step("Detected frameworks, adding extras: %s" % ", ".join(framework_additions))
         final_deps.update(framework_additions)
 
-    # 6b. Deduplicate and Merge Extras
-    deps_with_extras = [d for d in final_deps if "[" in d]
-    bases_to_remove = set()
-    for d in deps_with_extras:
-        base = d.split("[")[0]
-        bases_to_remove.add(base)
-
+    # 6b. Deduplicate and Merge Extras (one split per dep)
     merged_deps = {}  # type: Dict[str, Dict[str, Any]]
 
     for dep in final_deps:
-        if "[" in dep:
-            base = dep.split("[")[0]
-            extras_part = dep.split("[")[1].strip("]")
-            parsed_extras = set(e.strip() for e in extras_part.split(","))
-        else:
-            base = dep
-            parsed_extras = set()
-
-        version = None
-        if "==" in base:
-            parts = base.split("==")
-            base_name = parts[0]
-            version = parts[1]
-        else:
-            base_name = base
-
-        if base_name not in merged_deps:
-            merged_deps[base_name] = {"extras": set(), "version": version}
-
-        merged_deps[base_name]["extras"].update(parsed_extras)
-        if version:
-             merged_deps[base_name]["version"] = version
-
-    # Reconstruct dependencies
-    final_deps_list = []
-    for pkg, data in merged_deps.items():
-        extras = data["extras"]
-        version = data["version"]
+        base, _, extras_part = dep.partition("[")
+        base_name, _, version = base.partition("==")
 
-        suffix = ""
-        if extras:
-            sorted_extras = ",".join(sorted(extras))
-            suffix = "[%s]" % sorted_extras
+        entry = merged_deps.get(base_name)
+        if entry is None:
+            entry = merged_deps[base_name] = {"extras": set(), "version": None}
 
-        dep_str = "%s%s" % (pkg, suffix)
+        if extras_part:
+            entry["extras"].update(e.strip() for e in extras_part.strip("]").split(","))
         if version:
-            dep_str += "==%s" % version
-
-        final_deps_list.append(dep_str)
-
-    final_deps = set(final_deps_list)
-
-    # 7. Version Pinning
-    pinned_deps = []
-
-    from .utils import check_command_exists
+            entry["version"] = version
 
-    resolved_map = {}  # type: Dict[str, str]
-    uv_success = False
+    # 7. Reconstruct dependencies (explicit pins such as bcrypt==4.1.2 are kept as-is)
+    pinned_deps = set()  # type: Set[str]
 
-    if check_command_exists("uv") and False:  # Force Disable UV for speed
-        pass
-
-    if not uv_success:
-        pass
+    for pkg, data in merged_deps.items():
+        dep_str = pkg
+        if data["extras"]:
+            dep_str += "[" + ",".join(sorted(data["extras"])) + "]"
+        if data["version"]:
+            dep_str += "==" + data["version"]
 
-    # Apply resolved versions
-    for dep in final_deps:
-        clean_name = dep.split("[")[0].lower()
-
-        if clean_name in resolved_map:
-            resolved_str = resolved_map[clean_name]
-            version = resolved_str.split("==")[1]
-            pinned_deps.append("%s==%s" % (dep, version))
-        else:
-            if "==" in dep:
-                 pinned_deps.append(dep)
-            else:
-                 pinned_deps.append(dep)
+        pinned_deps.add(dep_str)
 
-    return sorted(list(set(pinned_deps)))
+    return sorted(pinned_deps)
@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import Iterator, List  # noqa: F401
+from typing import Iterator, List, Set  # noqa: F401
 
 from .utils import log
 
@@ -24,6 +24,32 @@ IGNORED_DIR_NAMES = frozenset({
     ".terraform", ".serverless",
 })
 
+# Glob-style suffixes (*.egg-info), matched with a single str.endswith call
+IGNORED_DIR_SUFFIXES = (".egg-info",)
+
+# Source files the scanner yields; str.endswith takes the whole tuple in one call
+_PY_SUFFIXES = (".py", ".ipynb")
+
+
+def _is_ignored_dir_name(name):
+    # type: (str) -> bool
+    """Name-only check: no filesystem access."""
+    return name in IGNORED_DIR_NAMES or name.endswith(IGNORED_DIR_SUFFIXES)
+
+
+def _is_venv_listing(dir_path, names):
+    # type: (str, Set[str]) -> bool
+    """
+    Detects a custom-named virtual environment from the directory's own
+    scandir listing. Only stats when a bin/ or Scripts/ dir is present.
+    """
+    if "pyvenv.cfg" in names:
+        return True
+    for scripts_dir in ("bin", "Scripts"):
+        if scripts_dir in names and os.path.exists(os.path.join(dir_path, scripts_dir, "activate")):
+            return True
+    return False
+
 
 def is_virtual_env(path):
     # type: (Path) -> bool
@@ -31,22 +57,17 @@ def is_virtual_env(path):
     Heuristic to check if a directory should be skipped.
     Checks for virtual environments, caches, build dirs, IDE dirs, etc.
     """
-    name = path.name
-
-    # Fast check: is the name in the ignored set?
-    if name in IGNORED_DIR_NAMES:
-        return True
-
-    # Glob-style: *.egg-info directories
-    if name.endswith(".egg-info"):
+    # Fast check: ignored name or *.egg-info
+    if _is_ignored_dir_name(path.name):
         return True
 
-    # Virtual environment indicators (for custom-named venvs)
-    if (path / "pyvenv.cfg").exists():
+    # Virtual environment indicators (for custom-named venvs), probed on plain strings
+    dir_path = str(path)
+    if os.path.exists(os.path.join(dir_path, "pyvenv.cfg")):
         return True
-    if (path / "bin" / "activate").exists():
+    if os.path.exists(os.path.join(dir_path, "bin", "activate")):
         return True
-    if (path / "Scripts" / "activate").exists():
+    if os.path.exists(os.path.join(dir_path, "Scripts", "activate")):
         return True
 
     return False
@@ -59,29 +80,41 @@ def iter_scan_directory(root_path):
     Enables pipeline: files can be parsed while scanning continues.
     Uses os.scandir() for fast directory iteration.
     """
-    stack = [root_path]
+    # Directories travel as plain strings; only yielded files become Path objects
+    stack = [str(root_path)]
+    # The root is popped first and always scanned; only directories below it can be venvs
+    is_root = True
 
     while stack:
         current_dir = stack.pop()
+        check_venv = not is_root
+        is_root = False
         try:
-            with os.scandir(str(current_dir)) as entries:
-                for entry in entries:
-                    try:
-                        if entry.is_symlink():
-                            continue
-
-                        if entry.is_dir(follow_symlinks=False):
-                            dir_path = Path(entry.path)
-                            if not is_virtual_env(dir_path):
-                                stack.append(dir_path)
-                        elif entry.is_file(follow_symlinks=False):
-                            name = entry.name
-                            if name.endswith(".py") or name.endswith(".ipynb"):
-                                yield Path(entry.path)
-                    except OSError:
+            with os.scandir(current_dir) as it:
+                entries = list(it)
+
+            # Custom-named venvs are recognised from their own listing (pyvenv.cfg),
+            # so ordinary directories cost no extra stat calls. The root is always scanned.
+            if check_venv and _is_venv_listing(
+                current_dir, set(entry.name for entry in entries)
+            ):
+                continue
+
+            for entry in entries:
+                try:
+                    if entry.is_symlink():
                         continue
+
+                    if entry.is_dir(follow_symlinks=False):
+                        if not _is_ignored_dir_name(entry.name):
+                            stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        if entry.name.endswith(_PY_SUFFIXES):
+                            yield Path(entry.path)
+                except OSError:
+                    continue
         except PermissionError as e:
-            log("Permission denied accessing %s: %s" % (str(current_dir), str(e)), level="ERROR")
+            log("Permission denied accessing %s: %s" % (current_dir, str(e)), level="ERROR")
         except OSError:
             continue
 
@@ -1,7 +1,12 @@
+import functools
 import os
 import shlex
 import subprocess
 import sys
+import threading
+import time
+from shutil import which
+from typing import Any, List, Optional  # noqa: F401
 
 # --- Rich Compatibility Layer ---
 # On Python < 3.8 or if rich is not installed, fall back to plain print.
@@ -32,139 +37,227 @@ BOLD = "\033[1m"
 DIM = "\033[2m"
 RESET = "\033[0m"
 
+# Constant halves of each ANSI line, joined once here instead of on every call
+_STEP_PREFIX = CYAN + "==>" + RESET + " " + BOLD
+_SUCCESS_PREFIX = GREEN + "\u2714 "
+_ERROR_PREFIX = RED + "\u2716 "
+_WARN_PREFIX = YELLOW + "\u26a0 "
+_DEBUG_PREFIX = DIM + "[DEBUG] "
+_LINE_END = RESET + "\n"
+
 # Global Verbosity Flag
 VERBOSE = False
 
+# shlex.split mode for string commands: Windows paths keep their backslashes
+_POSIX_SPLIT = sys.platform != "win32"
 
-def log(message, level="INFO"):
-    """
-    Wrapper around console.log/print.
-    """
-    if level == "DEBUG":
-        if VERBOSE:
-            if HAS_RICH:
-                console.print("[dim][DEBUG] %s[/dim]" % message)
-            else:
-                sys.stderr.write("%s[DEBUG] %s%s\n" % (DIM, message, RESET))
-    elif level == "WARNING":
-        if HAS_RICH:
-            console.print("[warning]\u26a0 %s[/warning]" % message)
-        else:
-            sys.stderr.write("%s\u26a0 %s%s\n" % (YELLOW, message, RESET))
-    elif level == "ERROR":
-        if HAS_RICH:
-            console.print("[error]\u2716 %s[/error]" % message)
-        else:
-            sys.stderr.write("%s\u2716 %s%s\n" % (RED, message, RESET))
-    else:
-        if HAS_RICH:
-            console.print(message)
-        else:
-            print(message)
+# Plain-write fast path for the frequent step/success lines: PYPM_PLAIN=1, or stdout
+# is not a terminal (pipes, CI logs), where rich would strip the styling anyway
+try:
+    _STDOUT_IS_TTY = sys.stdout.isatty()
+except (AttributeError, ValueError):
+    _STDOUT_IS_TTY = False
+FAST_OUTPUT = os.environ.get("PYPM_PLAIN") == "1" or not _STDOUT_IS_TTY
 
 
-def print_step(message):
-    if HAS_RICH:
-        console.print("[step]==> [/step] [bold]%s[/bold]" % message)
-    else:
-        print("%s==>%s %s%s%s" % (CYAN, RESET, BOLD, message, RESET))
+# Output writers are picked once at import: log() and print_* don't re-test the
+# level string, HAS_RICH or FAST_OUTPUT on every call
+if HAS_RICH:
+    def _log_debug(message):
+        console.print("[dim][DEBUG] " + message + "[/dim]")
 
+    def _log_warning(message):
+        console.print("[warning]\u26a0 " + message + "[/warning]")
 
-def print_success(message):
-    if HAS_RICH:
-        console.print("[success]\u2714 %s[/success]" % message)
-    else:
-        print("%s\u2714 %s%s" % (GREEN, message, RESET))
+    def _log_error(message):
+        console.print("[error]\u2716 " + message + "[/error]")
 
+    def _log_info(message):
+        console.print(message)
 
-def print_error(message):
-    if HAS_RICH:
-        console.print("[error]\u2716 %s[/error]" % message)
-    else:
-        sys.stderr.write("%s\u2716 %s%s\n" % (RED, message, RESET))
+    def _step_rich(message):
+        console.print("[step]==> [/step] [bold]" + message + "[/bold]")
 
+    def _success_rich(message):
+        console.print("[success]\u2714 " + message + "[/success]")
+else:
+    def _log_debug(message):
+        sys.stderr.write(_DEBUG_PREFIX + message + _LINE_END)
 
-def print_warning(message):
-    if HAS_RICH:
-        console.print("[warning]\u26a0 %s[/warning]" % message)
-    else:
-        sys.stderr.write("%s\u26a0 %s%s\n" % (YELLOW, message, RESET))
+    def _log_warning(message):
+        sys.stderr.write(_WARN_PREFIX + message + _LINE_END)
+
+    def _log_error(message):
+        sys.stderr.write(_ERROR_PREFIX + message + _LINE_END)
+
+    def _log_info(message):
+        sys.stdout.write(message + "\n")
+
+
+def _step_ansi(message):
+    sys.stdout.write(_STEP_PREFIX + message + _LINE_END)
+
+
+def _success_ansi(message):
+    sys.stdout.write(_SUCCESS_PREFIX + message + _LINE_END)
+
+
+def _step_plain(message):
+    sys.stdout.write("==> " + message + "\n")
+
+
+def _success_plain(message):
+    sys.stdout.write("\u2714 " + message + "\n")
+
+
+_LOG_WRITERS = {
+    "DEBUG": _log_debug,
+    "WARNING": _log_warning,
+    "ERROR": _log_error,
+}
+
+
+def log(message, *args, level="INFO"):
+    """
+    Wrapper around console.log/print.
+    Extra positional args are %-interpolated into message only if it is actually emitted.
+    """
+    # Bail out before any formatting; DEBUG is the hot, usually-silent path
+    if level == "DEBUG" and not VERBOSE:
+        return
+    if args:
+        message = message % args
+    _LOG_WRITERS.get(level, _log_info)(message)
+
+
+# print_step/print_success(message): progress lines on stdout
+if FAST_OUTPUT:
+    print_step = _step_ansi if _STDOUT_IS_TTY else _step_plain
+    print_success = _success_ansi if _STDOUT_IS_TTY else _success_plain
+elif HAS_RICH:
+    print_step = _step_rich
+    print_success = _success_rich
+else:
+    print_step = _step_ansi
+    print_success = _success_ansi
+
+# print_error/print_warning(message): same output as log() at ERROR/WARNING
+print_error = _log_error
+print_warning = _log_warning
+
+
+def print_block(lines):
+    # type: (List[str]) -> None
+    """
+    Prints related plain-text lines with a single write instead of one print() per line.
+    """
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def run_command(command, cwd=None):
     """
-    Runs a shell command. Returns True if successful, False otherwise.
+    Runs a command, given as an argv list or a shell-style string.
+    Returns True if successful, False otherwise.
     """
     try:
-        args = shlex.split(command, posix=(sys.platform != "win32"))
+        # Argv lists go straight to subprocess; only strings need tokenizing
+        if isinstance(command, str):
+            args = shlex.split(command, posix=_POSIX_SPLIT)
+        else:
+            args = list(command)
 
+        # Installer progress on stdout is never read, so don't buffer it; keep stderr for failures
         result = subprocess.run(args, cwd=cwd, check=False,
-                                stdout=subprocess.PIPE,
+                                stdout=subprocess.DEVNULL,
                                 stderr=subprocess.PIPE)
 
         if result.returncode != 0:
             print_error("Command failed with return code %d" % result.returncode)
+            stderr_text = result.stderr.decode("utf-8", "replace").strip()
+            if stderr_text:
+                sys.stderr.write(stderr_text + "\n")
             return False
 
         return True
     except FileNotFoundError:
-        print_error("Command not found: %s" % command)
+        print_error("Command not found: %s" % (command if isinstance(command, str) else " ".join(command)))
         return False
     except Exception as e:
         print_error("Error running command: %s" % str(e))
         return False
 
 
+@functools.lru_cache(maxsize=64)
+def _which_cached(command):
+    # type: (str) -> Optional[str]
+    return which(command)
+
+
 def check_command_exists(command):
     """
     Checks if a command exists effectively by trying to find it.
+    PATH lookups are memoized; call invalidate_which_cache() after installing tools.
     """
-    from shutil import which
-    return which(command) is not None
+    return _which_cached(command) is not None
 
 
-def get_optimal_workers(n_tasks, io_bound=False):
-    # type: (int, bool) -> int
-    """
-    Computes optimal thread pool size based on system resources.
-    Memory-aware: avoids overwhelming low-RAM systems (4GB).
-    Reduces thread stack size to 256KB (from default 8MB) for massive memory savings.
-    """
-    import threading as _threading
+def invalidate_which_cache():
+    # type: () -> None
+    """Forgets memoized PATH lookups (an install may have added new executables)."""
+    _which_cached.cache_clear()
 
-    # Reduce thread stack size on first call (256KB instead of default 8MB)
-    # 128 threads: 8MB default = 1GB stacks. 256KB = 32MB stacks.
+
+# Windows memory probe: struct and FFI binding are set up once at import.
+# A private WinDLL keeps our argtypes off the process-wide windll.kernel32 function;
+# if any of this fails, _probe_mem_cap falls back to its conservative default.
+_GlobalMemoryStatusEx = None  # type: Any
+if sys.platform == "win32":
     try:
-        _threading.stack_size(256 * 1024)
-    except (ValueError, RuntimeError):
-        pass  # Some platforms don't support stack_size
+        import ctypes
+
+        class _MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong),
+                ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong),
+                ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong),
+                ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong),
+                ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+
+        _GlobalMemoryStatusEx = ctypes.WinDLL("kernel32").GlobalMemoryStatusEx
+        _GlobalMemoryStatusEx.argtypes = [ctypes.POINTER(_MEMORYSTATUSEX)]
+        _GlobalMemoryStatusEx.restype = ctypes.c_int
+    except Exception:
+        _GlobalMemoryStatusEx = None
+
 
-    cpu = os.cpu_count() or 4
+# Process-wide thread stack size is applied once; CPU count and the memory probe
+# are cached, the latter refreshed at most every _MEM_PROBE_TTL seconds.
+_STACK_SIZE_SET = False
+_CPU_COUNT = os.cpu_count() or 4
+_MEM_PROBE_TTL = 5.0
+_mem_cap_cache = None  # type: Optional[int]
+_mem_cap_time = 0.0
 
-    # Memory-aware cap: detect available RAM
-    mem_cap = 128  # default max
+
+def _probe_mem_cap():
+    # type: () -> int
+    """
+    Memory-aware cap on thread count, derived from currently available RAM.
+    """
     try:
         if sys.platform == "win32":
             # Windows: use ctypes to get available physical memory
-            import ctypes
-            kernel32 = ctypes.windll.kernel32  # type: ignore[attr-defined]
-
-            class MEMORYSTATUSEX(ctypes.Structure):
-                _fields_ = [
-                    ("dwLength", ctypes.c_ulong),
-                    ("dwMemoryLoad", ctypes.c_ulong),
-                    ("ullTotalPhys", ctypes.c_ulonglong),
-                    ("ullAvailPhys", ctypes.c_ulonglong),
-                    ("ullTotalPageFile", ctypes.c_ulonglong),
-                    ("ullAvailPageFile", ctypes.c_ulonglong),
-                    ("ullTotalVirtual", ctypes.c_ulonglong),
-                    ("ullAvailVirtual", ctypes.c_ulonglong),
-                    ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
-                ]
-
-            mem_status = MEMORYSTATUSEX()
-            mem_status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
-            kernel32.GlobalMemoryStatusEx(ctypes.byref(mem_status))
+            if _GlobalMemoryStatusEx is None:
+                return 64  # Conservative fallback
+            mem_status = _MEMORYSTATUSEX()
+            mem_status.dwLength = ctypes.sizeof(_MEMORYSTATUSEX)
+            _GlobalMemoryStatusEx(ctypes.byref(mem_status))
             avail_mb = mem_status.ullAvailPhys // (1024 * 1024)
         else:
             # Linux/macOS: read /proc/meminfo or use os.sysconf
@@ -179,10 +272,37 @@ def get_optimal_workers(n_tasks, io_bound=False):
         # Each thread with 256KB stack + overhead ≈ 512KB
         # Reserve 512MB for the process itself
         usable_mb = max(256, avail_mb - 512)
-        mem_cap = max(4, usable_mb // 1)  # ~1MB per thread (stack + objects)
+        return max(4, usable_mb // 1)  # ~1MB per thread (stack + objects)
 
     except Exception:
-        mem_cap = 64  # Conservative fallback
+        return 64  # Conservative fallback
+
+
+def get_optimal_workers(n_tasks, io_bound=False):
+    # type: (int, bool) -> int
+    """
+    Computes optimal thread pool size based on system resources.
+    Memory-aware: avoids overwhelming low-RAM systems (4GB).
+    Reduces thread stack size to 256KB (from default 8MB) for massive memory savings.
+    """
+    global _STACK_SIZE_SET, _mem_cap_cache, _mem_cap_time
+
+    # Reduce thread stack size on first call (256KB instead of default 8MB)
+    # 128 threads: 8MB default = 1GB stacks. 256KB = 32MB stacks.
+    if not _STACK_SIZE_SET:
+        _STACK_SIZE_SET = True
+        try:
+            threading.stack_size(256 * 1024)
+        except (ValueError, RuntimeError):
+            pass  # Some platforms don't support stack_size
+
+    cpu = _CPU_COUNT
+
+    now = time.monotonic()
+    if _mem_cap_cache is None or now - _mem_cap_time > _MEM_PROBE_TTL:
+        _mem_cap_cache = _probe_mem_cap()
+        _mem_cap_time = now
+    mem_cap = _mem_cap_cache
 
     if io_bound:
         max_w = min(cpu * 12, 128, mem_cap)
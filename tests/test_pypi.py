@@ -0,0 +1,120 @@
+import http.client
+import json
+import time
+import types
+
+import pytest
+
+from pypm import pypi
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    # Point the on-disk caches at tmp_path and start with an empty resolve cache
+    monkeypatch.setattr(pypi, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(pypi, "CACHE_FILE", tmp_path / "cache.json")
+    monkeypatch.setattr(pypi, "RESOLVE_CACHE_FILE", tmp_path / "resolve.json")
+    monkeypatch.setattr(pypi, "_RESOLVE_CACHE", {})
+    return tmp_path
+
+
+class _Response:
+    status = 200
+
+    def read(self, amt=None):
+        return b"ok"
+
+
+class _FreshConnection:
+    def __init__(self, host, timeout=None):
+        self.closed = False
+
+    def request(self, method, path, headers=None):
+        pass
+
+    def getresponse(self):
+        return _Response()
+
+    def close(self):
+        self.closed = True
+
+
+class _DroppedConnection(_FreshConnection):
+    # An idle keep-alive connection the server has already closed
+    def request(self, method, path, headers=None):
+        raise http.client.RemoteDisconnected("Remote end closed connection")
+
+
+def test_resolve_cache_round_trip(cache_dir):
+    pypi.cache_resolution("yaml", "pyyaml")
+    assert pypi.get_cached_resolution("yaml") == "pyyaml"
+
+    pypi.flush_cache()
+    assert pypi._load_resolve_cache()["yaml"]["r"] == "pyyaml"
+
+def test_resolve_cache_ignores_expired_entries(cache_dir, monkeypatch):
+    pypi.cache_resolution("yaml", "pyyaml")
+    later = time.time() + pypi.RESOLVE_CACHE_TTL + 1
+    monkeypatch.setattr(pypi, "time", types.SimpleNamespace(time=lambda: later))
+    assert pypi.get_cached_resolution("yaml") is None
+
+def test_load_resolve_cache_drops_stale_and_malformed(cache_dir):
+    now = time.time()
+    (cache_dir / "resolve.json").write_text(json.dumps({
+        "fresh": {"r": "pkg", "t": now},
+        "with-extras": {"r": "pipecat-ai[aws,google]", "t": now},
+        "stale": {"r": "pkg", "t": now - pypi.RESOLVE_CACHE_TTL - 60},
+        "no-time": {"r": "pkg"},
+        "bad-result": {"r": ["pkg"], "t": now},
+        "empty-result": {"r": "", "t": now},
+        "injected": {"r": 'foo", "bar', "t": now},
+        "pinned": {"r": "foo==1.0", "t": now},
+        "not-a-dict": "pkg",
+    }))
+    assert list(pypi._load_resolve_cache()) == ["fresh", "with-extras"]
+
+def test_load_resolve_cache_survives_corrupt_file(cache_dir):
+    (cache_dir / "resolve.json").write_text("{not json")
+    assert pypi._load_resolve_cache() == {}
+
+@pytest.fixture
+def head_status(monkeypatch):
+    # HEAD probes over the keep-alive path answer with status[0]; package caches start empty
+    status = [200]
+    monkeypatch.setattr(pypi, "_get_session", lambda: None)
+    monkeypatch.setattr(pypi, "_keepalive_request", lambda method, path: (status[0], b""))
+    monkeypatch.setattr(pypi, "_PACKAGE_CACHE", {})
+    monkeypatch.setattr(pypi, "_METADATA_MEMORY_CACHE", {})
+    monkeypatch.setattr(pypi, "_CACHE_DIRTY", False)
+    return status
+
+
+def test_head_probe_server_error_is_not_cached(head_status):
+    head_status[0] = 503
+    assert pypi.check_package_exists_head("python-somethingreal") is False
+    assert "python-somethingreal" not in pypi._PACKAGE_CACHE
+    assert pypi._CACHE_DIRTY is False
+
+def test_head_probe_not_found_is_cached(head_status):
+    head_status[0] = 404
+    assert pypi.check_package_exists_head("python-nothing") is False
+    assert pypi._PACKAGE_CACHE["python-nothing"] is False
+
+@pytest.mark.skipif(pypi._HAS_REQUESTS, reason="keep-alive fallback is only used without requests")
+def test_keepalive_request_retries_dropped_connection(monkeypatch):
+    dropped = _DroppedConnection("pypi.org")
+    monkeypatch.setattr(pypi._THREAD_LOCAL, "conn", dropped, raising=False)
+    monkeypatch.setattr(http.client, "HTTPSConnection", _FreshConnection)
+
+    assert pypi._keepalive_request("HEAD", "/pypi/yaml/json") == (200, b"ok")
+    assert dropped.closed
+    assert isinstance(pypi._THREAD_LOCAL.conn, _FreshConnection)
+
+@pytest.mark.skipif(pypi._HAS_REQUESTS, reason="keep-alive fallback is only used without requests")
+def test_keepalive_request_retries_only_once(monkeypatch):
+    monkeypatch.setattr(pypi._THREAD_LOCAL, "conn", None, raising=False)
+    monkeypatch.setattr(http.client, "HTTPSConnection", _DroppedConnection)
+
+    with pytest.raises(http.client.RemoteDisconnected):
+        pypi._keepalive_request("HEAD", "/pypi/yaml/json")
+    assert pypi._THREAD_LOCAL.conn is None
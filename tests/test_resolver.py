@@ -1,4 +1,21 @@
-from pypm.resolver import is_stdlib
+import pytest
+
+from pypm import resolver
+from pypm.resolver import is_stdlib, resolve_dependencies
+
+
+@pytest.fixture
+def fake_pypi(monkeypatch):
+    # Offline PyPI: maps project name -> extras; the resolve cache is disabled
+    projects = {}
+    monkeypatch.setattr(resolver, "check_package_exists", lambda name: name.lower() in projects)
+    monkeypatch.setattr(resolver, "check_package_exists_head", lambda name: name.lower() in projects)
+    monkeypatch.setattr(resolver, "find_pypi_package", lambda name: name if name.lower() in projects else None)
+    monkeypatch.setattr(resolver, "get_package_extras", lambda name: projects.get(name.lower(), []))
+    monkeypatch.setattr(resolver, "get_cached_resolution", lambda key: None)
+    monkeypatch.setattr(resolver, "cache_resolution", lambda key, result: None)
+    monkeypatch.setattr(resolver, "flush_cache", lambda: None)
+    return projects
 
 
 def test_is_stdlib_true():
@@ -12,3 +29,34 @@ def test_is_stdlib_false():
     assert is_stdlib("pypm") is False
     assert is_stdlib("black") is False
     assert is_stdlib("numpy") is False
+
+def test_known_prefix_matches_every_import(fake_pypi, tmp_path):
+    # Case: a bundled-DB namespace package is found offline even when it shares a base with an unknown import
+    imports = {"google.cloud.storage.blob", "google.cloud.bigquery.table"}
+    assert resolve_dependencies(imports, tmp_path, set()) == ["google-cloud-storage"]
+
+def test_known_prefix_applies_common_mappings(fake_pypi, monkeypatch, tmp_path):
+    # Case: submodules of mapped or non-canonically spelled imports resolve offline
+    def no_network(name):
+        raise AssertionError("verified online: %s" % name)
+
+    monkeypatch.setattr(resolver, "check_package_exists", no_network)
+    monkeypatch.setattr(resolver, "find_pypi_package", no_network)
+    imports = {"psycopg2.extras", "psycopg2.pool", "cx_Oracle.x"}
+    assert resolve_dependencies(imports, tmp_path, set()) == ["cx_Oracle", "psycopg2-binary"]
+
+def test_submodules_extend_fast_path_base(fake_pypi, tmp_path):
+    # Case: pipecat resolves offline; its submodules must add extras, not be dropped
+    fake_pypi["pipecat-ai"] = ["aws", "google", "openai"]
+    imports = {"pipecat", "pipecat.aws", "pipecat.google"}
+    assert resolve_dependencies(imports, tmp_path, set()) == ["pipecat-ai[aws,google]"]
+
+def test_resolve_cache_hit_skips_verification(fake_pypi, monkeypatch, tmp_path):
+    # Case: a fresh resolve-cache entry answers without any PyPI lookup
+    def no_network(name):
+        raise AssertionError("verified online: %s" % name)
+
+    monkeypatch.setattr(resolver, "get_cached_resolution", {"internal_sdk": "internal-sdk-client"}.get)
+    monkeypatch.setattr(resolver, "check_package_exists", no_network)
+    monkeypatch.setattr(resolver, "find_pypi_package", no_network)
+    assert resolve_dependencies({"internal_sdk"}, tmp_path, set()) == ["internal-sdk-client"]
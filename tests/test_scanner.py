@@ -1,4 +1,4 @@
-from pypm.scanner import is_virtual_env
+from pypm.scanner import is_virtual_env, scan_directory
 
 
 def test_is_virtual_env_true(tmp_path):
@@ -26,3 +26,33 @@ def test_is_virtual_env_name_match(tmp_path):
     dot_venv = tmp_path / ".venv"
     dot_venv.mkdir()
     assert is_virtual_env(dot_venv) is True
+
+def test_is_virtual_env_name_needs_no_filesystem(tmp_path):
+    # Case: ignored names match before any probe, even if the path doesn't exist
+    assert is_virtual_env(tmp_path / "venv") is True
+    assert is_virtual_env(tmp_path / "node_modules") is True
+    assert is_virtual_env(tmp_path / "pkg.egg-info") is True
+    assert is_virtual_env(tmp_path / "missing") is False
+
+def test_scan_skips_custom_named_venv(tmp_path):
+    # Case: venvs are detected from their own listing, not their name
+    (tmp_path / "app.py").touch()
+    custom = tmp_path / "myenv"
+    (custom / "lib").mkdir(parents=True)
+    (custom / "pyvenv.cfg").touch()
+    (custom / "lib" / "site.py").touch()
+    legacy = tmp_path / "oldenv"
+    (legacy / "bin").mkdir(parents=True)
+    (legacy / "bin" / "activate").touch()
+    (legacy / "mod.py").touch()
+
+    found = [p.name for p in scan_directory(tmp_path)]
+    assert found == ["app.py"]
+
+def test_scan_root_is_never_skipped_as_venv(tmp_path):
+    # Case: the project root itself looks like a venv; only subdirectories are skipped
+    (tmp_path / "pyvenv.cfg").touch()
+    (tmp_path / "app.py").touch()
+
+    found = [p.name for p in scan_directory(tmp_path)]
+    assert found == ["app.py"]